@@ -6,15 +6,36 @@ import os
 import time
 import sys
 import io
+import locale
 import random
+import collections
+import functools
+import hashlib
+import struct
+import shelve
+import stat
 from PIL import Image, ImageTk
-from mutagen.mp3 import MP3
-from mutagen.oggvorbis import OggVorbis
-from mutagen.flac import FLAC
-from mutagen.wave import WAVE
-from mutagen.id3 import ID3NoHeaderError, APIC
-from mutagen import MutagenError
+# Prefer the Rust-backed mutagen-rs parser when installed (same API, much faster cold reads)
+try:
+    import mutagen_rs
+    from mutagen_rs.mp3 import MP3
+    from mutagen_rs.oggvorbis import OggVorbis
+    from mutagen_rs.flac import FLAC
+    from mutagen_rs.wave import WAVE
+    from mutagen_rs import MutagenError
+except ImportError:
+    mutagen_rs = None
+    from mutagen.mp3 import MP3
+    from mutagen.oggvorbis import OggVorbis
+    from mutagen.flac import FLAC
+    from mutagen.wave import WAVE
+    from mutagen import MutagenError
+try:
+    from mutagen.flac import Picture # Decodes Ogg METADATA_BLOCK_PICTURE art
+except ImportError:
+    Picture = None
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import traceback # For detailed error logging
 
 # --- Find Icon Path ---
@@ -46,13 +67,160 @@ FONT_LISTBOX = ("Helvetica", 9)
 FONT_BUTTON_FALLBACK = ("Helvetica", 8) # Smaller font for text buttons
 
 SUPPORTED_FORMATS = ('.mp3', '.ogg', '.wav', '.flac')
+SUPPORTED_FORMATS_SET = frozenset(SUPPORTED_FORMATS) # O(1) extension membership
 ICON_PATH = "icons" # Relative path to icons folder
 ALBUM_ART_SIZE = (100, 100)
+ART_CACHE_MAX = 64 # Decoded album art images kept for quick re-display (LRU)
+META_MEMO_MAX = 256 # Parsed metadata dicts kept in memory in front of the shelve (LRU)
+DIR_CACHE_MAX = 64 # Browser directory listings kept for revisits (LRU)
+META_CACHE_PATH = os.path.expanduser("~/.pypod_meta.db") # Persistent metadata cache (shelve)
+
+PREFETCH_AT_FRACTION = 0.9 # Read the next track into memory once playback passes this point
+PREFETCH_MAX_BYTES = 64 * 1024 * 1024 # Bigger files (long lossless rips) aren't read ahead; they load by path
+META_POOL_WORKERS = min(8, os.cpu_count() or 1) # Threads for background metadata reads
+TITLE_PREFETCH_BATCH = 32 # Rows read per pool batch; staleness is checked between batches
+POS_RESYNC_TICKS = 4 # Time display ticks between mixer get_pos() reads; extrapolated in between
+SKIP_DEBOUNCE_MS = 150 # Rapid Next/Prev presses within this window only load the last target
+DISPLAY_DEBOUNCE_MS = 50 # Bursts of title/artist/album updates only draw the last one
+BROWSER_INSERT_CHUNK = 256 # Browser rows inserted at a time; big folders only fill in as they're scrolled
+BROWSER_LOAD_MORE_AT = 0.9 # Scroll fraction of the inserted rows that pulls in the next chunk
+SEARCH_DEBOUNCE_MS = 200 # Search-as-you-type filters once typing pauses this long
+END_POLL_PLAYING_MS = 250 # End-of-track event poll interval while playing (bounds the gap between tracks)
+END_POLL_IDLE_MS = 500 # ...and while paused/stopped
 
 REPEAT_OFF = 0
 REPEAT_ONE = 1
 REPEAT_ALL = 2
 
+# --- Time Formatting ---
+# "MM:SS" for every second of the first 3 hours, built once; playback ticks just index into it
+_MMSS = tuple(f"{m:02d}:{s:02d}" for m in range(180) for s in range(60))
+_MMSS_LEN = len(_MMSS)
+
+def _format_seconds(secs):
+    """Formats whole seconds as MM:SS (table lookup; computed only past the table)."""
+    if 0 <= secs < _MMSS_LEN: return _MMSS[secs]
+    minutes, secs = divmod(max(secs, 0), 60) # Negative clamps to "00:00"
+    return f"{minutes:02d}:{secs:02d}"
+
+@functools.lru_cache(maxsize=512)
+def _ellipsize(text, max_len):
+    """Trims text to max_len characters, ending in '…' if cut. Memoized per (text, max_len)."""
+    return (text[:max_len-1] + '…') if len(text) > max_len else text
+
+def _decode_art(source, size=ALBUM_ART_SIZE):
+    """Decodes an image file path or raw bytes into a PhotoImage fitting `size`.
+       draft() lets JPEGs decode at a reduced scale instead of full resolution first."""
+    if isinstance(source, (bytes, bytearray)): source = io.BytesIO(source) # Shares the bytes, no copy
+    with Image.open(source) as img:
+        img.draft('RGB', size) # No-op for non-JPEG images
+        if img.mode == 'P': img = img.convert('RGBA') # Palette images would otherwise resize with NEAREST
+        img.thumbnail(size, Image.Resampling.BILINEAR) # In place; BILINEAR is plenty at this size
+        photo = ImageTk.PhotoImage(img) # Tk keeps its own copy of the pixels
+        img.close() # Free the decoded buffer now rather than at the next GC pass
+    return photo
+
+def _is_supported_name(name):
+    """True if a bare file name has a supported audio extension (one slice and a set lookup)."""
+    return name[name.rfind('.'):].lower() in SUPPORTED_FORMATS_SET
+
+
+# --- Metadata Readers ---
+# Each reader opens one format and fills title/artist/album and duration into `metadata`
+# (defaults are pre-filled). Dispatched by extension via _METADATA_READERS. Embedded art is
+# not part of it: it's only read for the track being shown (_read_art), so bulk scans and the
+# metadata cache don't carry every track's image bytes.
+def _first_tag(tags, key, default):
+    """First value of a tag as a string, or default (no throwaway default list per lookup)."""
+    values = tags.get(key)
+    return str(values[0]) if values else default
+
+def _read_mp3(filepath, metadata):
+    audio = MP3(filepath) # One open; tags is None when the file has no ID3 header
+    tags = audio.tags
+    if tags:
+        metadata['title'] = _first_tag(tags, 'TIT2', metadata['title'])
+        metadata['artist'] = _first_tag(tags, 'TPE1', metadata['artist'])
+        metadata['album'] = _first_tag(tags, 'TALB', metadata['album'])
+    metadata['duration'] = int(audio.info.length)
+
+def _read_ogg(filepath, metadata):
+    audio = OggVorbis(filepath)
+    metadata['title'] = _first_tag(audio, 'title', metadata['title'])
+    metadata['artist'] = _first_tag(audio, 'artist', metadata['artist'])
+    metadata['album'] = _first_tag(audio, 'album', metadata['album'])
+    metadata['duration'] = int(audio.info.length)
+
+def _read_flac(filepath, metadata):
+    audio = FLAC(filepath)
+    metadata['title'] = _first_tag(audio, 'title', metadata['title'])
+    metadata['artist'] = _first_tag(audio, 'artist', metadata['artist'])
+    metadata['album'] = _first_tag(audio, 'album', metadata['album'])
+    metadata['duration'] = int(audio.info.length)
+
+def _fast_duration_wav(filepath):
+    """Reads a WAV file's duration straight from its RIFF 'fmt '/'data' chunk headers.
+       Returns seconds, or None if the layout isn't understood (caller falls back to mutagen)."""
+    with open(filepath, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE': return None
+        byte_rate = 0
+        while True:
+            header = f.read(8)
+            if len(header) < 8: return None
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                if len(fmt) < 16: return None
+                byte_rate = struct.unpack_from('<I', fmt, 8)[0] # After format tag, channels, sample rate
+                if chunk_size % 2: f.seek(1, 1) # Chunks are word-aligned
+            elif chunk_id == b'data':
+                if not byte_rate or chunk_size == 0xFFFFFFFF: return None # No fmt yet / streamed size
+                return chunk_size / byte_rate
+            else:
+                f.seek(chunk_size + (chunk_size % 2), 1)
+
+def _read_wav(filepath, metadata):
+    # WAV carries no tags we display, so skip mutagen when the header can be read directly
+    duration = _fast_duration_wav(filepath)
+    if duration is None: duration = WAVE(filepath).info.length
+    metadata['duration'] = int(duration)
+
+_METADATA_READERS = {'.mp3': _read_mp3, '.ogg': _read_ogg, '.flac': _read_flac, '.wav': _read_wav}
+
+# --- Album Art Readers ---
+# Each returns the first embedded image's bytes, or None. Dispatched via _ART_READERS.
+def _art_mp3(filepath):
+    tags = MP3(filepath).tags
+    apic_frames = tags.getall('APIC') if tags else None
+    return apic_frames[0].data if apic_frames else None
+
+def _art_ogg(filepath):
+    pictures = OggVorbis(filepath).get('metadata_block_picture')
+    if not pictures or Picture is None: return None
+    try:
+        return Picture(pictures[0]).data # Assumes mutagen parses it
+    except Exception as e:
+        print(f"Error parsing Ogg picture block: {e}")
+        return None
+
+def _art_flac(filepath):
+    pictures = FLAC(filepath).pictures
+    return pictures[0].data if pictures else None
+
+_ART_READERS = {'.mp3': _art_mp3, '.ogg': _art_ogg, '.flac': _art_flac} # WAV carries no art
+
+def _read_art(filepath):
+    """Embedded album art bytes of a file, or None if it has none or can't be read."""
+    reader = _ART_READERS.get(os.path.splitext(filepath)[1].lower())
+    if reader is None: return None
+    try:
+        return reader(filepath)
+    except MutagenError as e: print(f"Mutagen error reading art from {filepath}: {e}")
+    except Exception as e: print(f"Error reading album art from {filepath}: {e}")
+    return None
+
+
 class MediaPlayerApp:
     def __init__(self, root):
         self.root = root
@@ -64,39 +232,95 @@ class MediaPlayerApp:
         # --- State ---
         self.playlist = [] # Current view (filtered/shuffled) list of paths
         self.original_playlist_order = [] # Master list of paths in original/sorted order
+        self._playlist_set = set() # Same paths as original_playlist_order, for O(1) membership tests
         self.current_track_index = -1 # Index relative to the *visible* self.playlist in listbox
         self.playback_history = [] # List of previous listbox indices for shuffle-back
         self.playing_state = "stopped" # stopped, playing, paused
         self.current_track_duration = 0
         self.update_seek_job = None # Tkinter .after job ID for time update
+        self._tick_gen = 0 # Bumped on every start/stop; a time tick from an older generation exits
+        self._last_time_str = None # Last text written to the current-time label
+        self._progress_last = 0 # Progress bar value as last advanced by update_time_display
+        self._progress_cap = 0 # Highest value the bar may step to (0 while duration is unknown)
+        self._pos_anchor = None # (mixer position ms, time.monotonic()) of the last get_pos() read
+        self._pos_ticks = 0 # Ticks since that read
+        self._ui_visible = True # False while the main window is unmapped (minimized/withdrawn)
+        self._prefetch_path = None # Next track being read ahead into memory
+        self._prefetch_data = None # Its file bytes once the background read finishes
+        self._playing_buffer = None # In-memory source of the current track (pygame streams from it)
+        self._play_gen = 0 # Bumped per play/stop request; stale background loads are dropped
+        self._preload_gen = 0 # Bumped per preload/play; stale background preload reads are dropped
+        self._mixer_load_lock = threading.Lock() # Serializes background music.load calls
+        self._pending_skip_job = None # .after job ID for a debounced Next/Prev
+        self._search_job = None # .after job ID for a debounced search-as-you-type filter
+        self._pending_skip_index = -1 # Listbox index the pending skip will play
+        self._display_job = None # .after job ID for a debounced title/artist/album update
+        self._display_pending = None # (title, artist, album) the pending job will show
         self.browser_window = None # Reference to the file browser Toplevel
         self.is_shuffled = False
         self.repeat_mode = REPEAT_OFF
         self.current_search_term = ""
-        self.listbox_path_map = {} # Maps visible listbox index to actual file path
+        self.listbox_path_map = [] # File path of each visible listbox row, by index (read via _path_at)
+        self._title_prefetch_gen = 0 # Bumped per listbox refill; stale title passes stop
+        self._sort_gen = 0 # Bumped per sort request; a sort whose tag reads finish late is dropped
+        self.track_metadata = {} # Maps file path to its parsed metadata (filled on first read)
+        self._dir_cache = collections.OrderedDict() # Browser listings (LRU): abspath -> (dir mtime_ns, folders, files)
+        self._browser_scan_gen = 0 # Bumped per browser navigation; stale directory scans are dropped
+        self._browser_rows_pending = None # (scan gen, rows, next index) of a listing not fully inserted
+        self._browser_more_job = None # after_idle job ID inserting the next chunk
 
         # State tracking for optimization
         self._last_applied_search = ""
         self._last_applied_shuffle = self.is_shuffled
+        self._filtered_cache = None # (search term, matching paths in master order) from the last filter
+        self._search_index = None # Lowercased search key per original_playlist_order entry (built lazily)
+
+        # --- Metadata Cache ---
+        # Keyed by "path|mtime_ns|size": in-process memo in front of a persistent shelve
+        self._meta_memo = collections.OrderedDict() # LRU capped at META_MEMO_MAX
+        self._meta_memo_lock = threading.Lock() # Pool workers update the LRU order concurrently
+        # Decoded album art keyed by a digest of the embedded image (tracks of one album share an entry);
+        # the original bytes aren't kept
+        self._art_cache = collections.OrderedDict()
+        self._art_gen = 0 # Bumped per art request/reset; stale art reads are dropped
+        self._art_path = None # Track whose art the label shows (None: placeholder)
+        self._meta_cache = self._open_meta_cache()
+        self._meta_cache_lock = threading.Lock() # shelve isn't thread-safe
+        # Shared pool for metadata reads (I/O-bound; mutagen releases the GIL during file reads).
+        # Workers post results with root.after, so the Tk thread must never wait on its futures.
+        self._meta_pool = ThreadPoolExecutor(max_workers=META_POOL_WORKERS, thread_name_prefix="meta")
 
         # --- Load Icons ---
-        self.icons = {} # Stores PhotoImage objects if loaded
+        self.icons = {} # PhotoImage per icon name, decoded on first use (None if it couldn't be loaded)
+        self._icon_paths = {} # Icon name -> file path of each icon found on disk
         self.icon_fallbacks = {} # Stores fallback text for each icon name
         self.default_album_art = None # Will hold the loaded/created placeholder art
+        self.tree_icons = {} # Browser Treeview icons ('folder'/'file'), shared by every browser window
+        self._button_configs = {} # (is ttk, icon name) -> configure() options, built on first use
+        self._button_icon_shown = {} # Button -> icon name it currently shows
         self.load_icons()
 
-        # --- Initialize Pygame Mixer ---
-        try:
-            pygame.mixer.init()
-            # Set the event type for when music finishes
-            self.MUSIC_END_EVENT = pygame.USEREVENT + 1
-            pygame.mixer.music.set_endevent(self.MUSIC_END_EVENT)
-            print("Pygame mixer initialized.")
-        except pygame.error as e:
-            # Show error before root might be destroyed
-            messagebox.showerror("Pygame Error", f"Could not initialize audio mixer: {e}\nPlease ensure audio drivers are working.")
-            self.root.destroy() # Destroy root if mixer fails
-            return # Stop initialization
+        # --- Initialize Pygame ---
+        # Only the event queue (which MUSIC_END_EVENT is delivered through) starts now.
+        # The mixer is initialized on first playback (_ensure_mixer) so an idle app holds no audio device.
+        self.MUSIC_END_EVENT = pygame.USEREVENT + 1 # Event type for when music finishes
+        self._mixer_ready = False
+        self._playing_gen = -1 # _play_gen of the track that started playing; end events must match it
+        self._mixer_get_pos = pygame.mixer.music.get_pos # Bound once for the time tick
+        # Track ends come from MUSIC_END_EVENT where the event queue is usable, else from polling get_busy()
+        self._end_via_events = False
+        if sys.platform == "darwin":
+            # SDL's video subsystem would start a second Cocoa app alongside Tk's
+            print("Detecting track ends by polling the mixer (no pygame event queue on macOS).")
+        else:
+            try:
+                pygame.display.init() # Event queue only; no window is opened
+                pygame.event.set_blocked(None) # Block every event type from the queue...
+                pygame.event.set_allowed(self.MUSIC_END_EVENT) # ...except end-of-track, the only one we read
+                pygame.event.clear() # Drop anything posted by display.init() before the block
+                self._end_via_events = True
+            except pygame.error as e: # e.g. headless, no video driver
+                print(f"Could not initialize pygame events ({e}); detecting track ends by polling the mixer.")
 
         # --- Build UI ---
         self.create_menu()
@@ -105,11 +329,15 @@ class MediaPlayerApp:
 
         # --- Bind Events ---
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # Suspend the time display while the window is minimized/unmapped
+        self.root.bind('<Unmap>', self._on_root_unmap)
+        self.root.bind('<Map>', self._on_root_map)
         # Start checking for the music end event
         self.check_music_end()
 
     def load_icons(self):
-        """Loads icons from the ICON_PATH folder and sets up fallbacks."""
+        """Finds icons in the ICON_PATH folder and sets up fallbacks. Only the album art placeholder
+           (shown at startup) is decoded here; button/browser icons are decoded on first use."""
         icon_definitions = {
             "play": ("play.png", "Play"), "pause": ("pause.png", "Pause"),
             "next": ("next.png", ">>"), "previous": ("previous.png", "<<"),
@@ -131,13 +359,11 @@ class MediaPlayerApp:
                  if not os.path.exists(fpath): raise FileNotFoundError(f"Icon not found: {fpath}")
 
                  if name == 'placeholder':
-                      # Resize placeholder immediately
-                      pil_img = Image.open(fpath).resize(ALBUM_ART_SIZE, Image.Resampling.LANCZOS)
-                      self.default_album_art = ImageTk.PhotoImage(pil_img)
+                      # Scale the placeholder down immediately
+                      self.default_album_art = _decode_art(fpath)
                       self.icons[name] = self.default_album_art # Store the PhotoImage
                  else:
-                      img = PhotoImage(file=fpath)
-                      self.icons[name] = img
+                      self._icon_paths[name] = fpath # Decoded by _get_icon when a widget needs it
 
             except FileNotFoundError:
                  missing_icons.append(filename)
@@ -170,25 +396,46 @@ class MediaPlayerApp:
             # Create a minimal Tkinter image as last resort? (Difficult without Pillow)
 
 
+    def _get_icon(self, name):
+        """Returns the PhotoImage for an icon, decoding it on first use; None if missing or unloadable."""
+        if name in self.icons: return self.icons[name]
+        img = None
+        fpath = self._icon_paths.get(name)
+        if fpath:
+            try:
+                # Same PIL decode path as the art; the file is closed as soon as Tk has the pixels
+                with Image.open(fpath) as pil_img:
+                    img = ImageTk.PhotoImage(pil_img)
+            except Exception as e:
+                print(f"Error loading icon '{os.path.basename(fpath)}': {e}. Using text fallback.")
+                if not isinstance(e, (tk.TclError, OSError)): traceback.print_exc() # Don't trace known/common issues
+        self.icons[name] = img # Failures are cached too, so each icon is tried once
+        return img
+
     def configure_button_icon(self, button, icon_name):
         """Sets button image if icon exists, otherwise sets text fallback.
            Handles both tk.Button and ttk.Button correctly using styles for ttk."""
-        if icon_name in self.icons and isinstance(self.icons[icon_name], PhotoImage):
-            # Icon exists, apply it
-            button.config(image=self.icons[icon_name], text="", width=0, height=0) # Let image dictate size
-            # Reset style for ttk buttons to base if they were previously fallback
-            if isinstance(button, ttk.Button):
-                 button.configure(style="TButton") # Use configure for style change
-        else:
-            # Icon missing or failed to load, use fallback text
-            fallback = self.icon_fallbacks.get(icon_name, "?")
-            button.config(image="") # Clear image if any
-            if isinstance(button, ttk.Button):
-                # For ttk.Button, apply the fallback style
-                button.configure(text=fallback, style="Fallback.TButton", width=0) # width=0 allows text to size
-            else:
-                # For tk.Button, configure directly
-                button.config(text=fallback, font=FONT_BUTTON_FALLBACK, width=0, height=0, padx=5, pady=2)
+        if self._button_icon_shown.get(button) == icon_name: return # Already showing it
+        is_ttk = isinstance(button, ttk.Button)
+        options = self._button_configs.get((is_ttk, icon_name))
+        if options is None:
+            options = self._button_configs[is_ttk, icon_name] = self._build_button_config(is_ttk, icon_name)
+        button.configure(**options) # One configure call per state change
+        self._button_icon_shown[button] = icon_name
+
+    def _build_button_config(self, is_ttk, icon_name):
+        """Builds the configure() options for one (button kind, icon) pair."""
+        icon = self._get_icon(icon_name)
+        if icon is not None:
+            # Icon exists; let the image dictate size. ttk buttons go back to the base style.
+            if is_ttk: return {'image': icon, 'text': "", 'width': 0, 'style': "TButton"}
+            return {'image': icon, 'text': "", 'width': 0, 'height': 0}
+        # Icon missing or failed to load, use fallback text
+        fallback = self.icon_fallbacks.get(icon_name, "?")
+        if is_ttk: # ttk buttons take their fallback font from the style
+            return {'image': "", 'text': fallback, 'style': "Fallback.TButton", 'width': 0}
+        return {'image': "", 'text': fallback, 'font': FONT_BUTTON_FALLBACK,
+                'width': 0, 'height': 0, 'padx': 5, 'pady': 2}
 
 
     def create_menu(self):
@@ -285,23 +532,28 @@ class MediaPlayerApp:
         self.album_art_label.image = art_image # Keep reference even if None
         self.album_art_label.grid(row=0, column=0, rowspan=4, sticky='nsew', padx=(0, 10), pady=5) # Use nsew sticky
 
-        # Track Info Labels
-        self.track_title_label = tk.Label(screen_area, text="---", anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_SCREEN)
+        # Track Info Labels (bound to StringVars so updates are a single variable write)
+        self.track_title_var = tk.StringVar(value="---")
+        self.track_artist_var = tk.StringVar(value="---")
+        self.track_album_var = tk.StringVar(value="---")
+        self.track_title_label = tk.Label(screen_area, textvariable=self.track_title_var, anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_SCREEN)
         self.track_title_label.grid(row=0, column=1, sticky='ew', padx=5)
-        self.track_artist_label = tk.Label(screen_area, text="---", anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_METADATA)
+        self.track_artist_label = tk.Label(screen_area, textvariable=self.track_artist_var, anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_METADATA)
         self.track_artist_label.grid(row=1, column=1, sticky='ew', padx=5)
-        self.track_album_label = tk.Label(screen_area, text="---", anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_METADATA)
+        self.track_album_label = tk.Label(screen_area, textvariable=self.track_album_var, anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_METADATA)
         self.track_album_label.grid(row=2, column=1, sticky='ew', padx=5)
 
         # Progress Bar & Time Frame
         progress_time_frame = tk.Frame(screen_area, bg=SCREEN_BG)
         progress_time_frame.grid(row=3, column=1, sticky='sew', padx=5, pady=(2, 0)) # Use sticky 's' to push down
         progress_time_frame.columnconfigure(1, weight=1)
-        self.current_time_label = tk.Label(progress_time_frame, text="00:00", anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_TIME)
+        self.current_time_var = tk.StringVar(value="00:00")
+        self.total_time_var = tk.StringVar(value="/ 00:00")
+        self.current_time_label = tk.Label(progress_time_frame, textvariable=self.current_time_var, anchor='w', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_TIME)
         self.current_time_label.grid(row=0, column=0, sticky='w')
         self.progress_bar = ttk.Progressbar(progress_time_frame, orient=tk.HORIZONTAL, length=100, mode='determinate', style="custom.Horizontal.TProgressbar")
         self.progress_bar.grid(row=0, column=1, sticky='ew', padx=5)
-        self.total_time_label = tk.Label(progress_time_frame, text="/ 00:00", anchor='e', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_TIME)
+        self.total_time_label = tk.Label(progress_time_frame, textvariable=self.total_time_var, anchor='e', bg=SCREEN_BG, fg=TEXT_COLOR, font=FONT_TIME)
         self.total_time_label.grid(row=0, column=2, sticky='e')
 
         # Border around screen area
@@ -316,6 +568,7 @@ class MediaPlayerApp:
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30, font=FONT_MAIN)
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
         self.search_entry.bind("<Return>", self.search_playlist_action)
+        self.search_entry.bind("<KeyRelease>", self._on_search_typed)
 
         # Create ttk buttons first, then configure with icon/fallback
         ttk_button_opts = {"style": "TButton"} # Base style
@@ -331,8 +584,9 @@ class MediaPlayerApp:
         list_frame = tk.Frame(main_frame)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        self._listbox_var = tk.Variable(value=()) # Row texts; set() swaps the whole list in one step
         self.playlist_box = tk.Listbox(
-            list_frame, bg=SCREEN_BG, fg=TEXT_COLOR, selectbackground=SELECT_BG,
+            list_frame, listvariable=self._listbox_var, bg=SCREEN_BG, fg=TEXT_COLOR, selectbackground=SELECT_BG,
             selectforeground=TEXT_COLOR, font=FONT_LISTBOX, activestyle='none',
             highlightthickness=0, bd=0, relief=tk.FLAT, yscrollcommand=scrollbar.set
         )
@@ -346,7 +600,7 @@ class MediaPlayerApp:
         control_frame = tk.Frame(main_frame, bg=BG_COLOR)
         control_frame.pack(fill=tk.X)
         self.volume_scale = ttk.Scale(control_frame, from_=0, to=100, orient=tk.HORIZONTAL, command=self.set_volume, style="custom.Horizontal.TScale")
-        self.volume_scale.set(70); pygame.mixer.music.set_volume(0.7) # Set initial volume
+        self.volume_scale.set(70) # Initial volume; applied to the mixer when it starts
         self.volume_scale.pack(fill=tk.X, pady=(0, 5))
 
         button_frame = tk.Frame(control_frame, bg=BG_COLOR)
@@ -442,20 +696,23 @@ class MediaPlayerApp:
         tree_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
         self.browser_tree = ttk.Treeview(
             tree_frame, columns=("fullpath",), displaycolumns="",
-            yscrollcommand=tree_scrollbar.set, selectmode='extended',
+            # Scrolling near the end also pulls in more rows of a long listing
+            yscrollcommand=lambda first, last: self._on_browser_yscroll(tree_scrollbar, first, last),
+            selectmode='extended',
             style="custom.Treeview" # Uses style defined in create_styles
         )
         tree_scrollbar.config(command=self.browser_tree.yview)
         tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.browser_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.browser_tree.bind("<Double-1>", self.browser_item_activated)
-
-        # Prepare icons for treeview (check if loaded)
-        self.tree_icons = {}
-        if 'folder' in self.icons and isinstance(self.icons['folder'], PhotoImage):
-             self.tree_icons['folder'] = self.icons['folder']
-        if 'file' in self.icons and isinstance(self.icons['file'], PhotoImage):
-             self.tree_icons['file'] = self.icons['file']
+        # Pick the browser icons on first open; later browser windows reuse the same Tk image handles
+        if not self.tree_icons:
+            for name in ('folder', 'file'):
+                icon = self._get_icon(name)
+                if icon is not None: self.tree_icons[name] = icon
+        # One image reference per tag instead of one per row
+        for tag, icon in self.tree_icons.items():
+            self.browser_tree.tag_configure(tag, image=icon)
 
         action_frame = tk.Frame(self.browser_window, bg=BG_COLOR)
         action_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -499,59 +756,131 @@ class MediaPlayerApp:
 
 
     def populate_browser(self, path):
-        """Fills the browser Treeview with contents of the given path."""
+        """Fills the browser Treeview with contents of the given path
+           (from the listing cache, or from a background scan when the folder is new or changed)."""
         try:
-             if not os.path.isdir(path):
+             dir_stat = os.stat(path)
+             if not stat.S_ISDIR(dir_stat.st_mode):
                  self.show_warning("Invalid Path", f"Cannot browse: {path}", parent=self.browser_window)
                  return
              abs_path = os.path.abspath(path)
              self.current_path_var.set(abs_path)
+        except FileNotFoundError:
+             self.show_warning("Invalid Path", f"Cannot browse: {path}", parent=self.browser_window)
+             return
         except OSError as e:
              self.show_error("Path Error", f"Cannot access path properties:\n{e}", parent=self.browser_window)
              return
 
-        # Clear existing tree items safely
-        for i in self.browser_tree.get_children():
-            try: self.browser_tree.delete(i)
-            except tk.TclError: pass # Ignore if item already deleted
+        # Clear existing tree items in one call
+        children = self.browser_tree.get_children()
+        if children:
+            try: self.browser_tree.delete(*children)
+            except tk.TclError as e: print(f"Error clearing browser items: {e}")
+
+        # Revisiting an unchanged directory reuses its last listing (adding/removing entries bumps its mtime)
+        self._browser_scan_gen += 1 # Any scan still running is for a folder we've left
+        cached = self._dir_cache.get(abs_path)
+        if cached and cached[0] == dir_stat.st_mtime_ns:
+            self._dir_cache.move_to_end(abs_path)
+            self._insert_browser_rows(self._browser_scan_gen, cached[1], cached[2])
+            return
+        # List the directory on a worker thread so a huge or slow (network) folder doesn't freeze the UI
+        threading.Thread(target=self._scan_dir_worker,
+                         args=(self._browser_scan_gen, abs_path, dir_stat.st_mtime_ns), daemon=True).start()
 
-        items = []
+    def _scan_dir_worker(self, gen, path, mtime_ns):
+        """Worker thread: lists a directory's subfolders and supported files, sorted by name,
+           and posts the result (or the error) back to the Tk thread."""
+        folders, files = [], []
+        # Bind hot-loop lookups to locals
+        add_folder, add_file, is_supported = folders.append, files.append, _is_supported_name
         try:
-            items = os.listdir(path)
-            items.sort(key=str.lower)
-        except OSError as e:
-            self.show_error("Permission Error", f"Cannot read directory:\n{e}", parent=self.browser_window)
+            # scandir hands back the dirent type, so most entries need no extra stat
+            with os.scandir(path) as it:
+                for entry in it:
+                    if gen != self._browser_scan_gen: return # Navigated elsewhere meanwhile
+                    name = entry.name
+                    try:
+                        if entry.is_dir():
+                            add_folder((name, entry.path))
+                        elif is_supported(name) and entry.is_file():
+                            add_file((name, entry.path))
+                    except OSError as e: # Permission error on specific item
+                        print(f"Skipping item due to access error: {entry.path} ({e})")
+            folders.sort(key=lambda item: item[0].lower())
+            files.sort(key=lambda item: item[0].lower())
+        except Exception as e:
+            try: self.root.after(0, self._on_dir_scan_failed, gen, e)
+            except RuntimeError: pass # Tk already shut down
             return
-        except Exception as e: # Catch other potential errors
-            self.show_error("Error", f"Failed to list directory contents:\n{e}", parent=self.browser_window)
+        try: self.root.after(0, self._on_dir_scanned, gen, path, mtime_ns, folders, files)
+        except RuntimeError: pass # Tk already shut down
+
+    def _browser_scan_current(self, gen):
+        """True if a scan result is for the folder still shown in an open browser window."""
+        if gen != self._browser_scan_gen or not self.browser_window: return False
+        try: return bool(self.browser_window.winfo_exists())
+        except tk.TclError: return False
+
+    def _on_dir_scanned(self, gen, path, mtime_ns, folders, files):
+        """Caches and shows a finished directory listing (Tk thread), unless it's stale."""
+        self._dir_cache[path] = (mtime_ns, folders, files)
+        self._dir_cache.move_to_end(path) # A rescan of a changed folder replaces its entry in place
+        if len(self._dir_cache) > DIR_CACHE_MAX:
+            self._dir_cache.popitem(last=False) # Evict the least recently visited
+        if self._browser_scan_current(gen):
+            self._insert_browser_rows(gen, folders, files)
+
+    def _on_dir_scan_failed(self, gen, error):
+        """Reports a failed directory listing (Tk thread), unless it's stale."""
+        if not self._browser_scan_current(gen): return
+        if isinstance(error, OSError):
+            self.show_error("Permission Error", f"Cannot read directory:\n{error}", parent=self.browser_window)
+        else: # Catch other potential errors
+            self.show_error("Error", f"Failed to list directory contents:\n{error}", parent=self.browser_window)
+
+    def _insert_browser_rows(self, gen, folders, files):
+        """Inserts a listing into the browser Treeview: folders first, then files.
+           Only the first BROWSER_INSERT_CHUNK rows go in now; the rest follow a chunk at a time
+           as the view is scrolled towards the end (_on_browser_yscroll)."""
+        # Build every row first (folders, then files); chunks then insert from this one list.
+        # Icons come from the 'folder'/'file' tag configuration, so rows carry no image of their own.
+        rows = []
+        for tag, entries in (('folder', folders), ('file', files)):
+            tags = (tag,)
+            rows.extend((f" {name}", (fullpath,), tags) for name, fullpath in entries)
+        self._insert_browser_chunk(gen, rows, 0)
+
+    def _insert_browser_chunk(self, gen, rows, start):
+        """Inserts rows[start:start + BROWSER_INSERT_CHUNK]; the remainder is kept for scrolling."""
+        self._browser_rows_pending = None
+        if start and not self._browser_scan_current(gen): return # Navigated away or window closed
+        # Raw Tcl calls skip ttk.Treeview.insert's per-call option formatting; tuples go over as Tcl lists
+        tree = self.browser_tree
+        call, widget = tree.tk.call, tree._w
+        end = start + BROWSER_INSERT_CHUNK
+        try:
+            for text, values, tags in rows[start:end]:
+                call(widget, 'insert', '', 'end', '-text', text, '-values', values, '-tags', tags)
+        except Exception as e:
+            print(f"Error inserting browser items: {e}")
             return
-
-        folders, files = [], []
-        for item in items:
-             full_item_path = os.path.join(path, item)
-             try:
-                 if os.path.isdir(full_item_path):
-                     folders.append((item, full_item_path))
-                 elif item.lower().endswith(SUPPORTED_FORMATS) and os.path.isfile(full_item_path):
-                     files.append((item, full_item_path))
-             except OSError as e: # Permission error on specific item
-                 print(f"Skipping item due to access error: {full_item_path} ({e})")
-                 continue
-             except Exception as e: # Other errors accessing item properties
-                 print(f"Error processing item {item}: {e}")
-                 continue
-
-        folder_icon = self.tree_icons.get('folder') # Get loaded icon image
-        for name, fullpath in folders:
-            try: # Insert folder items
-                 self.browser_tree.insert('', tk.END, text=f" {name}", values=(fullpath,), image=folder_icon, tags=('folder',))
-            except Exception as e: print(f"Error inserting folder item {name}: {e}")
-
-        file_icon = self.tree_icons.get('file') # Get loaded icon image
-        for name, fullpath in files:
-            try: # Insert file items
-                 self.browser_tree.insert('', tk.END, text=f" {name}", values=(fullpath,), image=file_icon, tags=('file',))
-            except Exception as e: print(f"Error inserting file item {name}: {e}")
+        if end < len(rows):
+            self._browser_rows_pending = (gen, rows, end)
+
+    def _on_browser_yscroll(self, scrollbar, first, last):
+        """Browser Treeview scroll callback: moves the scrollbar, and queues the next chunk of
+           a long listing once the bottom of the inserted rows comes into view."""
+        scrollbar.set(first, last)
+        if self._browser_rows_pending and not self._browser_more_job and float(last) > BROWSER_LOAD_MORE_AT:
+            self._browser_more_job = self.root.after_idle(self._load_more_browser_rows)
+
+    def _load_more_browser_rows(self):
+        """Inserts the next pending chunk of the browser listing (idle callback)."""
+        self._browser_more_job = None
+        if self._browser_rows_pending:
+            self._insert_browser_chunk(*self._browser_rows_pending)
 
     def browser_navigate_up(self):
         """Navigates the browser view to the parent directory."""
@@ -646,12 +975,13 @@ class MediaPlayerApp:
 
         files_to_add = []
         try:
-            for item in os.listdir(current_path):
-                if item.lower().endswith(SUPPORTED_FORMATS):
-                    filepath = os.path.join(current_path, item)
-                    # Check if it's actually a file and exists
-                    if os.path.isfile(filepath):
-                         files_to_add.append(filepath)
+            # scandir gives the joined path and cached entry type without extra stat calls
+            append, is_supported = files_to_add.append, _is_supported_name
+            with os.scandir(current_path) as it:
+                for entry in it:
+                    # Name check first: it's free, while is_file() stats symlinks
+                    if is_supported(entry.name) and entry.is_file():
+                        append(entry.path)
         except OSError as e:
             self.show_error("Error Reading Folder", f"Could not read folder contents:\n{e}", parent=self.browser_window)
             return
@@ -662,7 +992,8 @@ class MediaPlayerApp:
 
         if files_to_add:
              files_to_add.sort(key=str.lower) # Sort files within the folder
-             self.add_files_to_playlist(files_to_add)
+             # scandir paths under the (absolute) browser path are normalized files already
+             self.add_files_to_playlist(files_to_add, already_validated=True)
              self.show_info("Folder Added", f"{len(files_to_add)} file(s) from folder added.", parent=self.browser_window)
         else:
              self.show_warning("Empty Folder", "No supported music files found in this folder.", parent=self.browser_window)
@@ -673,40 +1004,88 @@ class MediaPlayerApp:
     def _repopulate_listbox(self, path_list=None):
         """Helper to clear and refill the listbox from a given list of paths.
            Updates the crucial self.listbox_path_map."""
-        start_time = time.time()
-        self.playlist_box.delete(0, tk.END)
+        self._cancel_pending_skip() # Indices are about to change
         if path_list is None:
             path_list = self.playlist # Default to the current view
 
-        self.listbox_path_map = {} # Reset the map
-
-        # Consider using list comprehension for slight speedup if needed
-        # items_to_insert = [f"{i+1}. {os.path.basename(filepath)}" for i, filepath in enumerate(path_list)]
-        # self.playlist_box.insert(tk.END, *items_to_insert) # Insert all at once? Check performance
-
-        for i, filepath in enumerate(path_list):
-            display_name = os.path.basename(filepath)
-            self.playlist_box.insert(tk.END, f"{i+1}. {display_name}")
-            self.listbox_path_map[i] = filepath # Map listbox index to file path
-
-        end_time = time.time()
-        # print(f"Repopulated listbox with {len(path_list)} items in {end_time - start_time:.4f} seconds.")
-
-
-    def add_files_to_playlist(self, files_to_add):
-        """Adds a list of valid file paths to the master playlist order and updates the view."""
+        self.listbox_path_map = list(path_list) # Row index -> file path; a snapshot, workers may hold it
+
+        # Replace every row at once through the listvariable (no separate delete + insert)
+        basename = os.path.basename # Hoisted out of the per-row comprehension
+        self._listbox_var.set(tuple(f"{i+1}. {basename(filepath)}" for i, filepath in enumerate(path_list)))
+
+        # Rows show basenames instantly; tag titles stream in from a background pass
+        self._start_title_prefetch()
+
+    def _path_at(self, index):
+        """File path shown at a listbox index, or None if out of range (including -1)."""
+        if 0 <= index < len(self.listbox_path_map): return self.listbox_path_map[index]
+        return None
+
+    def _start_title_prefetch(self):
+        """Starts a background pass that upgrades listbox rows from filenames to tag titles.
+           Visible rows are fetched first."""
+        self._title_prefetch_gen += 1
+        path_map = self.listbox_path_map
+        if not path_map: return
+        first_visible = self.playlist_box.nearest(0)
+        order = list(range(first_visible, len(path_map))) + list(range(first_visible))
+        threading.Thread(target=self._title_prefetch_worker,
+                         args=(self._title_prefetch_gen, order, path_map), daemon=True).start()
+
+    def _title_prefetch_worker(self, gen, order, path_map):
+        """Worker thread: reads metadata in parallel batches on the metadata pool and
+           posts each batch's row patches back to the Tk thread in one call."""
+        basename = os.path.basename
+        for start in range(0, len(order), TITLE_PREFETCH_BATCH):
+            if gen != self._title_prefetch_gen: return # Listbox was refilled, this pass is stale
+            batch = order[start:start + TITLE_PREFETCH_BATCH]
+            paths = [path_map[index] for index in batch]
+            try:
+                results = list(self._meta_pool.map(self.get_playlist_metadata, paths))
+            except RuntimeError: return # Pool shut down (closing)
+            patches = [(index, metadata['title']) for index, filepath, metadata in zip(batch, paths, results)
+                       if metadata['title'] != basename(filepath)]
+            if patches:
+                try: self.root.after(0, self._patch_listbox_rows, gen, patches)
+                except (RuntimeError, tk.TclError): return # Main loop has shut down
+
+    def _patch_listbox_rows(self, gen, patches):
+        """Replaces the display text of a batch of (index, title) listbox rows, preserving selection."""
+        if gen != self._title_prefetch_gen: return
+        listbox = self.playlist_box
+        size = listbox.size()
+        for index, title in patches:
+            if index >= size: continue
+            try:
+                selected = listbox.selection_includes(index)
+                listbox.delete(index)
+                listbox.insert(index, f"{index+1}. {title}")
+                if selected: listbox.selection_set(index)
+            except tk.TclError as e:
+                print(f"Error updating listbox row {index}: {e}")
+
+
+    def add_files_to_playlist(self, files_to_add, already_validated=False):
+        """Adds a list of valid file paths to the master playlist order and updates the view.
+           already_validated skips the normalize/isfile pass for paths known to be absolute,
+           normalized regular files (e.g. straight from a scandir pass)."""
         newly_added_paths = []
         skipped_count = 0
         duplicate_count = 0
         for filepath in files_to_add:
             try:
-                # Ensure path is absolute and normalized for consistency
-                abs_path = os.path.abspath(os.path.normpath(filepath))
-                if not os.path.isfile(abs_path): # Use isfile which implies exists
-                     print(f"Skipping non-existent or non-file path: {abs_path}")
-                     skipped_count += 1
-                     continue
-                if abs_path not in self.original_playlist_order:
+                if already_validated:
+                    abs_path = filepath
+                else:
+                    # Ensure path is absolute and normalized for consistency
+                    abs_path = os.path.abspath(os.path.normpath(filepath))
+                    if not os.path.isfile(abs_path): # Use isfile which implies exists
+                         print(f"Skipping non-existent or non-file path: {abs_path}")
+                         skipped_count += 1
+                         continue
+                if abs_path not in self._playlist_set:
+                    self._playlist_set.add(abs_path)
                     self.original_playlist_order.append(abs_path)
                     newly_added_paths.append(abs_path)
                 else:
@@ -733,7 +1112,7 @@ class MediaPlayerApp:
             return # Nothing new was actually added
 
         # Update the view (applies filter/shuffle)
-        self._apply_filters_and_shuffle()
+        self._apply_filters_and_shuffle(force_refresh=True) # Master list changed
 
         # Auto-select first track if playlist was previously empty
         if len(self.original_playlist_order) == len(newly_added_paths) and self.playing_state == "stopped":
@@ -743,28 +1122,46 @@ class MediaPlayerApp:
                  self.preload_track_info(0)
 
 
+    def clear_playlist_action(self):
+        """Stops playback and removes every track from the playlist."""
+        if not self.original_playlist_order:
+            print("Playlist already empty.")
+            return
+        self.stop_track()
+        self.original_playlist_order = []
+        self._playlist_set = set()
+        self.playlist = []
+        self.current_track_index = -1
+        self.playback_history = []
+        self._clear_metadata_memo()
+        if mutagen_rs is not None and hasattr(mutagen_rs, 'clear_cache'):
+            mutagen_rs.clear_cache() # Release the parser's internal per-file result cache
+        self._apply_filters_and_shuffle(force_refresh=True) # Empties the listbox and display
+        print("Playlist cleared.")
+
+
     def preload_track_info(self, listbox_index):
          """Loads metadata for a track at the given listbox index without playing it."""
          if 0 <= listbox_index < self.playlist_box.size():
-             filepath = self.listbox_path_map.get(listbox_index)
+             filepath = self._path_at(listbox_index)
              if filepath:
                  # Check existence *before* getting metadata (get_track_metadata also checks, but good practice here too)
                  if not os.path.isfile(filepath):
                       self.show_warning("File Missing", f"Cannot load info: File not found\n{os.path.basename(filepath)}")
                       self.update_track_display(title=f"[Missing] {os.path.basename(filepath)}", artist="", album="")
-                      self.update_album_art({'art_data': None}) # Reset art
+                      self._show_default_art()
                       self.progress_bar['value'] = 0
                       self.progress_bar['maximum'] = 100
                       return
 
-                 # Use a thread to avoid blocking UI for metadata loading? (More complex)
-                 # For now, load directly:
-                 metadata = self.get_track_metadata(filepath) # Safe to call now
-                 self.current_track_duration = metadata.get('duration', 0)
-                 self.update_track_display(metadata['title'], metadata['artist'], metadata['album'])
-                 self.update_album_art(metadata)
-                 self.progress_bar['value'] = 0
-                 self.progress_bar['maximum'] = self.current_track_duration if self.current_track_duration > 0 else 100
+                 self._preload_gen += 1
+                 metadata = self.track_metadata.get(filepath)
+                 if metadata is not None:
+                     self._show_track_metadata(filepath, metadata)
+                     return
+                 # Not read yet: parse on the metadata pool so the UI doesn't block
+                 try: self._meta_pool.submit(self._preload_worker, self._preload_gen, filepath)
+                 except RuntimeError: pass # Pool shut down (closing)
              else:
                   print(f"Error: No path found for listbox index {listbox_index} in map.")
                   self.update_track_display(clear=True)
@@ -773,6 +1170,17 @@ class MediaPlayerApp:
              self.update_track_display(clear=True)
 
 
+    def _preload_worker(self, gen, filepath):
+        """Pool worker: reads metadata for preload_track_info and posts it to the Tk thread."""
+        metadata = self.get_playlist_metadata(filepath)
+        try: self.root.after(0, self._on_preload_metadata, gen, filepath, metadata)
+        except RuntimeError: pass # Tk already shut down
+
+    def _on_preload_metadata(self, gen, filepath, metadata):
+        """Shows preloaded metadata unless a newer preload or a play superseded it."""
+        if gen != self._preload_gen: return
+        self._show_track_metadata(filepath, metadata)
+
     # --- Playlist Loading/Saving ---
     # (Unchanged, already includes reasonable error handling)
     def load_playlist_dialog(self):
@@ -784,14 +1192,15 @@ class MediaPlayerApp:
 
         paths = []
         try:
-            # Try UTF-8 first, then fallback to default system encoding
+            with open(filepath, 'rb') as f: # Read once; decoding is retried in memory
+                raw = f.read()
+            # Try UTF-8 first (a BOM is dropped), then fallback to default system encoding
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    paths = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+                text = raw.decode('utf-8-sig')
             except UnicodeDecodeError:
                 print("UTF-8 decode failed, trying default system encoding...")
-                with open(filepath, 'r') as f: # Use system default encoding
-                    paths = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+                text = raw.decode(locale.getpreferredencoding(False), errors='replace')
+            paths = [line for line in map(str.strip, text.splitlines()) if line and not line.startswith('#')]
 
         except FileNotFoundError:
             self.show_error("Load Error", f"Playlist file not found:\n{filepath}")
@@ -806,12 +1215,26 @@ class MediaPlayerApp:
 
         if paths:
             print(f"Read {len(paths)} lines from playlist.")
-            # Filter out paths that don't exist *at load time*
+            # Filter out paths that don't exist *at load time*.
+            # One scandir per parent folder replaces a stat per track (tracks cluster in album folders).
+            abs_paths = [os.path.abspath(os.path.normpath(p)) for p in paths] # Normalize before check
+            names_by_dir = collections.defaultdict(set)
+            for abs_p in abs_paths:
+                folder, name = os.path.split(abs_p)
+                names_by_dir[folder].add(name)
+            found = set()
+            for folder, names in names_by_dir.items():
+                try:
+                    with os.scandir(folder) as it:
+                        for entry in it:
+                            if entry.name in names and entry.is_file(): found.add(entry.path)
+                except OSError:
+                    pass # Unreadable/missing folder: its tracks get the per-file check below
             existing_paths = []
             skipped = 0
-            for p in paths:
-                abs_p = os.path.abspath(os.path.normpath(p)) # Normalize before check
-                if os.path.isfile(abs_p):
+            for p, abs_p in zip(paths, abs_paths):
+                # isfile only for names the listing didn't match (missing, or case differs on Windows/macOS)
+                if abs_p in found or os.path.isfile(abs_p):
                      existing_paths.append(abs_p)
                 else:
                      print(f"Skipping missing/invalid path from playlist: {p}")
@@ -825,9 +1248,11 @@ class MediaPlayerApp:
                     self.stop_track()
                     self.playlist = []
                     self.original_playlist_order = []
+                    self._playlist_set = set()
                     self.current_track_index = -1
                     self.playback_history = [] # Clear history too
-                    self.add_files_to_playlist(existing_paths) # Adds the verified paths
+                    self._clear_metadata_memo()
+                    self.add_files_to_playlist(existing_paths, already_validated=True) # Adds the verified paths
                     self.show_info("Playlist Loaded", f"Loaded {len(existing_paths)} tracks.")
             elif paths: # Paths were read, but none exist
                 self.show_warning("Empty Playlist", "All files listed in the playlist could not be found or were invalid.")
@@ -853,9 +1278,9 @@ class MediaPlayerApp:
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write("#EXTM3U\n") # Standard M3U header
-                for path in self.original_playlist_order:
-                    # Could add #EXTINF here with duration/title if metadata is cached
-                    f.write(path + "\n")
+                # Could add #EXTINF here with duration/title if metadata is cached
+                f.write("\n".join(self.original_playlist_order)) # One write for the whole list
+                f.write("\n")
             self.show_info("Playlist Saved", f"Playlist saved to:\n{filepath}")
         except OSError as e:
             self.show_error("Save Error", f"Could not write playlist file:\n{e}")
@@ -865,52 +1290,87 @@ class MediaPlayerApp:
 
 
     # --- Metadata fetching ---
+    def _open_meta_cache(self):
+        """Opens the persistent metadata cache. Returns None if it can't be opened."""
+        try:
+            return shelve.open(META_CACHE_PATH)
+        except Exception as e:
+            print(f"Could not open metadata cache '{META_CACHE_PATH}': {e}. Continuing without it.")
+            return None
+
     def get_track_metadata(self, filepath):
-        """Reads metadata using mutagen. Handles file not found."""
-        # Check file existence first
-        if not os.path.isfile(filepath): # Use isfile for robustness
+        """Returns metadata for a file, served from the cache when the file is unchanged.
+           Handles file not found."""
+        # One stat both checks existence and builds the cache key
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
              print(f"Metadata fetch skipped: File not found or not a file: {filepath}")
-             return {'title': f"[Missing] {os.path.basename(filepath)}", 'artist': "", 'album': "", 'duration': 0, 'art_data': None}
+             return {'title': f"[Missing] {os.path.basename(filepath)}", 'artist': "", 'album': "", 'duration': 0}
+
+        cache_key = f"{filepath}|{st.st_mtime_ns}|{st.st_size}"
+        with self._meta_memo_lock:
+            metadata = self._meta_memo.get(cache_key)
+            if metadata is not None:
+                self._meta_memo.move_to_end(cache_key)
+                return metadata
+
+        if self._meta_cache is not None:
+            try:
+                with self._meta_cache_lock:
+                    if self._meta_cache is not None: # Re-check: on_closing may have closed it
+                        metadata = self._meta_cache.get(cache_key)
+            except Exception as e:
+                print(f"Error reading metadata cache for {filepath}: {e}")
+            if metadata is not None:
+                metadata.pop('art_data', None) # Entries written before art was read separately
+                self._remember_metadata(cache_key, metadata)
+                return metadata
+
+        metadata = self._read_track_metadata(filepath)
+        if not metadata['title'].endswith("(Meta Error)"): # Don't cache failed reads
+            self._remember_metadata(cache_key, metadata)
+            if self._meta_cache is not None:
+                try:
+                    with self._meta_cache_lock:
+                        if self._meta_cache is not None: # Re-check: on_closing may have closed it
+                            self._meta_cache[cache_key] = metadata
+                except Exception as e: print(f"Error writing metadata cache for {filepath}: {e}")
+        return metadata
+
+    def _remember_metadata(self, cache_key, metadata):
+        """Adds an entry to the in-process metadata LRU, evicting the least recently used."""
+        with self._meta_memo_lock:
+            self._meta_memo[cache_key] = metadata
+            self._meta_memo.move_to_end(cache_key)
+            if len(self._meta_memo) > META_MEMO_MAX:
+                self._meta_memo.popitem(last=False)
+
+    def _clear_metadata_memo(self):
+        """Forgets in-memory metadata (playlist cleared or replaced); the shelve keeps its entries."""
+        self.track_metadata = {}
+        with self._meta_memo_lock:
+            self._meta_memo.clear()
+
+    def get_playlist_metadata(self, filepath):
+        """Returns the metadata stored for a playlist entry, reading it on first use."""
+        metadata = self.track_metadata.get(filepath)
+        if metadata is None:
+            metadata = self.get_track_metadata(filepath)
+            if not metadata['title'].startswith("[Missing]"): # Missing files may reappear
+                self.track_metadata[filepath] = metadata
+        return metadata
 
-        metadata = {'title': os.path.basename(filepath), 'artist': 'Unknown Artist', 'album': 'Unknown Album', 'duration': 0, 'art_data': None}
+    def _read_track_metadata(self, filepath):
+        """Reads metadata from an existing file using mutagen (uncached)."""
+        metadata = {'title': os.path.basename(filepath), 'artist': 'Unknown Artist', 'album': 'Unknown Album', 'duration': 0}
         try:
-            # --- Metadata reading logic (same as before) ---
+            # Single extension lookup dispatches to the format's reader
             ext = os.path.splitext(filepath)[1].lower()
-            audio = None; art_data = None
-            if ext == '.mp3':
-                try: audio = MP3(filepath, ID3=ID3)
-                except ID3NoHeaderError: audio = MP3(filepath)
-                if audio and audio.tags:
-                    metadata['title'] = str(audio.tags.get('TIT2', [metadata['title']])[0])
-                    metadata['artist'] = str(audio.tags.get('TPE1', [metadata['artist']])[0])
-                    metadata['album'] = str(audio.tags.get('TALB', [metadata['album']])[0])
-                    apic_frames = audio.tags.getall('APIC')
-                    if apic_frames: art_data = apic_frames[0].data
-            elif ext == '.ogg':
-                audio = OggVorbis(filepath)
-                if audio:
-                    metadata['title'] = str(audio.get('title', [metadata['title']])[0])
-                    metadata['artist'] = str(audio.get('artist', [metadata['artist']])[0])
-                    metadata['album'] = str(audio.get('album', [metadata['album']])[0])
-                    pictures = audio.get('metadata_block_picture')
-                    if pictures:
-                         try:
-                             from mutagen.flac import Picture
-                             picture_info = Picture(pictures[0]) # Assumes mutagen parses it
-                             art_data = picture_info.data
-                         except Exception as e: print(f"Error parsing Ogg picture block: {e}")
-            elif ext == '.flac':
-                audio = FLAC(filepath)
-                if audio:
-                    metadata['title'] = str(audio.get('title', [metadata['title']])[0])
-                    metadata['artist'] = str(audio.get('artist', [metadata['artist']])[0])
-                    metadata['album'] = str(audio.get('album', [metadata['album']])[0])
-                    if audio.pictures: art_data = audio.pictures[0].data
-            elif ext == '.wav': audio = WAVE(filepath)
-
-            if audio and hasattr(audio, 'info') and hasattr(audio.info, 'length'):
-                 metadata['duration'] = int(audio.info.length)
-            metadata['art_data'] = art_data
+            reader = _METADATA_READERS.get(ext)
+            if reader: reader(filepath, metadata)
 
             # Cleanup potentially empty tags
             if not metadata['title'] or metadata['title'].startswith("[Missing]"): metadata['title'] = os.path.basename(filepath)
@@ -930,13 +1390,14 @@ class MediaPlayerApp:
     # --- Playback ---
     def play_track(self, listbox_index):
         """Plays the track corresponding to the given listbox index."""
+        self._cancel_pending_skip() # A direct play supersedes any debounced skip
         if not self.playlist or not (0 <= listbox_index < len(self.playlist)):
             # This might happen if list changes rapidly. Just stop.
             print(f"Play request for invalid index: {listbox_index} (Playlist size: {len(self.playlist)})")
             self.stop_track()
             return
 
-        filepath = self.listbox_path_map.get(listbox_index)
+        filepath = self._path_at(listbox_index)
 
         # Robust File Check (isfile implies exists)
         if not filepath or not os.path.isfile(filepath):
@@ -956,7 +1417,7 @@ class MediaPlayerApp:
         # --- Proceed with playback ---
         # Update history *before* changing current_track_index
         if self.current_track_index != -1 and self.current_track_index != listbox_index:
-             prev_path = self.listbox_path_map.get(self.current_track_index)
+             prev_path = self._path_at(self.current_track_index)
              if prev_path != filepath: # Only add if it's truly a different track
                   self.playback_history.append(self.current_track_index)
                   # Limit history size
@@ -966,24 +1427,29 @@ class MediaPlayerApp:
         self.current_track_index = listbox_index # Update index *after* history logic
 
         try:
-            # Load metadata (file known to exist)
-            metadata = self.get_track_metadata(filepath)
-            self.current_track_duration = metadata.get('duration', 0)
-
-            # Update display elements
-            self.update_track_display(metadata['title'], metadata['artist'], metadata['album'])
-            self.update_album_art(metadata) # Update art *before* potential pygame load delay
+            self._play_gen += 1
+            self._preload_gen += 1 # A preload still in flight must not overwrite this track's display
+            # Metadata was usually already read by the title pass or preload (file known to exist)
+            metadata = self.track_metadata.get(filepath)
+            if metadata is not None:
+                self._show_track_metadata(filepath, metadata) # Display *before* the pygame load
+            else:
+                # Not read yet: show the filename now; the load worker parses the tags off the Tk thread
+                self.current_track_duration = 0
+                self.update_track_display(os.path.basename(filepath), "", "")
             self.select_listbox_item(self.current_track_index)
-            self.progress_bar['value'] = 0
-            self.progress_bar['maximum'] = self.current_track_duration if self.current_track_duration > 0 else 100
 
-            # Load and play with pygame
-            pygame.mixer.music.load(filepath)
-            pygame.mixer.music.play()
-            self.playing_state = "playing"
-            self.update_play_pause_button()
-            # self.start_time_update() # Time update now handled by check_music_end/pygame event loop
-            print(f"Playing [{self.current_track_index}]: {filepath}")
+            if not self._ensure_mixer():
+                self.stop_track()
+                return
+
+            # Load on a worker thread (disk I/O + decoder setup); _on_track_loaded starts playback.
+            # The read-ahead buffer is used if this track was prefetched.
+            data = self._prefetch_data if self._prefetch_path == filepath else None
+            self._prefetch_path = self._prefetch_data = None
+            self.stop_time_update()
+            threading.Thread(target=self._load_track_worker,
+                             args=(self._play_gen, filepath, data, metadata is None), daemon=True).start()
 
         except pygame.error as e:
             self.show_error("Playback Error", f"Could not play file:\n{os.path.basename(filepath)}\n\nPygame Error: {e}")
@@ -1002,8 +1468,10 @@ class MediaPlayerApp:
         removed_from_original = False
         try:
             # Remove from the source of truth
-            if filepath in self.original_playlist_order:
+            if filepath in self._playlist_set:
                  self.original_playlist_order.remove(filepath)
+                 self._playlist_set.discard(filepath)
+                 self.track_metadata.pop(filepath, None)
                  print(f"Removed track from master list: {filepath}")
                  removed_from_original = True
             else:
@@ -1013,7 +1481,7 @@ class MediaPlayerApp:
 
             if removed_from_original:
                  # Refresh the playlist view (applies filters/shuffle again)
-                 self._apply_filters_and_shuffle()
+                 self._apply_filters_and_shuffle(force_refresh=True) # Master list changed
 
                  # If the removed track *was* the currently playing/selected one,
                  # the index is implicitly handled by _apply_filters_and_shuffle finding nothing playing.
@@ -1036,6 +1504,92 @@ class MediaPlayerApp:
 
 
     # --- Playback Controls ---
+    def _load_track_worker(self, gen, filepath, data, read_metadata):
+        """Worker thread: (optionally) reads the track's metadata, then loads it into the mixer
+           for play_track, handing each result back to the Tk thread."""
+        if read_metadata:
+            metadata = self.get_playlist_metadata(filepath)
+            try: self.root.after(0, self._on_track_metadata, gen, filepath, metadata) # Runs before _on_track_loaded
+            except RuntimeError: return # Tk already shut down
+        try:
+            with self._mixer_load_lock: # One load at a time; a newer request wins
+                if gen != self._play_gen: return # Superseded before we got the mixer
+                if data is not None:
+                    source = io.BytesIO(data)
+                    pygame.mixer.music.load(source, filepath) # Path as namehint for format detection
+                else:
+                    source = None
+                    pygame.mixer.music.load(filepath)
+        except Exception as e:
+            try: self.root.after(0, self._on_track_load_failed, gen, filepath, e)
+            except RuntimeError: pass # Tk already shut down
+            return
+        try: self.root.after(0, self._on_track_loaded, gen, filepath, source)
+        except RuntimeError: pass # Tk already shut down
+
+    def _on_track_metadata(self, gen, filepath, metadata):
+        """Shows metadata read by the load worker (Tk thread), unless another track was requested."""
+        if gen != self._play_gen: return
+        self._show_track_metadata(filepath, metadata)
+
+    def _show_track_metadata(self, filepath, metadata):
+        """Displays a track's metadata: labels, total time/progress bar range and album art."""
+        self.current_track_duration = metadata.get('duration', 0)
+        self.update_track_display(metadata['title'], metadata['artist'], metadata['album'])
+        self._request_album_art(filepath)
+
+    def _request_album_art(self, filepath):
+        """Reads a track's embedded art on the metadata pool; the current art stays up until it arrives."""
+        if filepath == self._art_path: return # Already showing this track's art
+        self._art_gen += 1
+        try: self._meta_pool.submit(self._album_art_worker, self._art_gen, filepath)
+        except RuntimeError: pass # Pool shut down (closing)
+
+    def _album_art_worker(self, gen, filepath):
+        """Pool worker: reads the art bytes for _request_album_art and posts them to the Tk thread."""
+        art_data = _read_art(filepath)
+        # Short digest as the art cache key, hashed here rather than on the Tk thread
+        art_key = hashlib.blake2b(art_data, digest_size=16).digest() if art_data else None
+        try: self.root.after(0, self._on_album_art, gen, filepath, art_data, art_key)
+        except RuntimeError: pass # Tk already shut down
+
+    def _on_album_art(self, gen, filepath, art_data, art_key):
+        """Shows art read by the worker unless a newer request or a reset superseded it."""
+        if gen != self._art_gen: return
+        self._art_path = filepath
+        self.update_album_art(art_data, art_key)
+
+    def _show_default_art(self):
+        """Shows the placeholder art and drops any art read still in flight."""
+        self._art_gen += 1
+        self._art_path = None
+        self.update_album_art(None)
+
+    def _on_track_loaded(self, gen, filepath, source):
+        """Starts playback of a freshly loaded track (Tk thread); stale loads are dropped."""
+        if gen != self._play_gen: return # Another track was requested, or playback stopped
+        try:
+            self._playing_buffer = source # In-memory source must outlive playback
+            self._discard_end_events() # Posted when load() halted the previous track
+            pygame.mixer.music.play()
+        except pygame.error as e:
+            self._on_track_load_failed(gen, filepath, e)
+            return
+        self._playing_gen = gen # End events now belong to this track
+        self.playing_state = "playing"
+        self.update_play_pause_button()
+        self.start_time_update()
+        print(f"Playing [{self.current_track_index}]: {filepath}")
+
+    def _on_track_load_failed(self, gen, filepath, error):
+        """Reports a failed load/play of the current request (Tk thread)."""
+        if gen != self._play_gen: return
+        if isinstance(error, pygame.error):
+            self.show_error("Playback Error", f"Could not play file:\n{os.path.basename(filepath)}\n\nPygame Error: {error}")
+        else:
+            self.show_error("Playback Error", f"An unexpected error occurred during playback initiation:\n{error}")
+        self.stop_track()
+
     def toggle_play_pause(self):
         """Toggles playback state between playing and paused, or starts playback."""
         if not self.playlist:
@@ -1046,14 +1600,14 @@ class MediaPlayerApp:
             try:
                 pygame.mixer.music.pause()
                 self.playing_state = "paused"
-                # Time update stops naturally via check_music_end loop condition
+                self.stop_time_update()
                 print("Playback paused.")
             except pygame.error as e: print(f"Error pausing music: {e}")
         elif self.playing_state == "paused":
             try:
                 pygame.mixer.music.unpause()
                 self.playing_state = "playing"
-                # Time update restarts naturally via check_music_end loop condition
+                self.start_time_update()
                 print("Playback resumed.")
             except pygame.error as e: print(f"Error unpausing music: {e}")
         else: # "stopped"
@@ -1082,11 +1636,16 @@ class MediaPlayerApp:
 
     def stop_track(self):
         """Stops playback completely."""
-        try:
-            pygame.mixer.music.stop()
-            # pygame.mixer.music.unload() # Optional: Frees memory but needs reload
-        except pygame.error as e: print(f"Error stopping music: {e}")
+        if self._mixer_ready:
+            try:
+                pygame.mixer.music.stop()
+                # pygame.mixer.music.unload() # Optional: Frees memory but needs reload
+                self._discard_end_events() # stop() fires the end hook too; that's not a track ending
+            except pygame.error as e: print(f"Error stopping music: {e}")
         self.playing_state = "stopped"
+        self._play_gen += 1 # Drop any track still loading
+        self._cancel_pending_skip()
+        self.stop_time_update()
         self.update_play_pause_button()
         self.update_track_display(clear=True) # Clear display
         self.progress_bar['value'] = 0
@@ -1105,24 +1664,28 @@ class MediaPlayerApp:
         # if self.playing_state == "stopped" and from_event==False: return # Original logic
 
         next_index = -1
+        # Step from a still-pending skip target so rapid presses keep advancing
+        current_index = self._pending_skip_index if self._pending_skip_job else self.current_track_index
 
-        if self.repeat_mode == REPEAT_ONE and not from_event: # Only repeat if auto-advancing
-            next_index = self.current_track_index # Request to play same track again
-        elif self.current_track_index < current_list_size - 1:
-             next_index = self.current_track_index + 1 # Standard next
+        if self.repeat_mode == REPEAT_ONE and from_event: # Only repeat if auto-advancing
+            next_index = current_index # Request to play same track again
+        elif current_index < current_list_size - 1:
+             next_index = current_index + 1 # Standard next
         elif self.repeat_mode == REPEAT_ALL:
              next_index = 0 # Wrap around if repeating all
         else:
              # End of playlist, not repeating all
-             # Only show message/stop if auto-advancing (from_event==False)
-             if not from_event:
+             # Only show message/stop if auto-advancing (from_event==True)
+             if self._pending_skip_job: return # Pending skip already targets the last track
+             if from_event:
                  self.stop_track()
                  self.show_info("Playback Finished", "End of playlist.")
              # If user clicked Next at end, do nothing unless repeating
              return
 
         if next_index != -1:
-             self.play_track(next_index)
+             if from_event: self.play_track(next_index) # Auto-advance plays immediately
+             else: self._schedule_skip(next_index)
 
 
     def prev_track(self):
@@ -1134,7 +1697,7 @@ class MediaPlayerApp:
 
         # Restart current track if played for > 3 seconds
         try:
-            if self.playing_state == "playing" and pygame.mixer.music.get_busy() and pygame.mixer.music.get_pos() > 3000:
+            if not self._pending_skip_job and self.playing_state == "playing" and pygame.mixer.music.get_busy() and pygame.mixer.music.get_pos() > 3000:
                  if self.current_track_index != -1:
                      print("Restarting current track.")
                      self.play_track(self.current_track_index) # Re-trigger play_track
@@ -1143,6 +1706,8 @@ class MediaPlayerApp:
 
 
         prev_index = -1
+        # Step from a still-pending skip target so rapid presses keep going back
+        current_index = self._pending_skip_index if self._pending_skip_job else self.current_track_index
 
         # Handle shuffle history
         if self.is_shuffled and self.playback_history:
@@ -1150,7 +1715,7 @@ class MediaPlayerApp:
                  # Get last played index from history
                  prev_index = self.playback_history.pop()
                  # Validate if this index is still valid *in the current view*
-                 if not (0 <= prev_index < current_list_size and self.listbox_path_map.get(prev_index)):
+                 if not (0 <= prev_index < current_list_size and self._path_at(prev_index)):
                      print(f"History index {prev_index} invalid, reverting to standard previous.")
                      prev_index = -1 # Fallback
              except IndexError:
@@ -1159,8 +1724,8 @@ class MediaPlayerApp:
 
         # Standard previous logic (or fallback from shuffle)
         if prev_index == -1:
-             if self.current_track_index > 0:
-                 prev_index = self.current_track_index - 1 # Standard previous
+             if current_index > 0:
+                 prev_index = current_index - 1 # Standard previous
              elif self.repeat_mode == REPEAT_ALL:
                  prev_index = current_list_size - 1 # Wrap around if repeating
              else:
@@ -1170,16 +1735,39 @@ class MediaPlayerApp:
 
         # Play the determined previous index if valid
         if prev_index != -1 and (0 <= prev_index < current_list_size):
-             self.play_track(prev_index)
-        elif current_list_size > 0 and self.current_track_index != -1: # Only one track? Restart it.
+             self._schedule_skip(prev_index)
+        elif current_list_size > 0 and current_index != -1: # Only one track? Restart it.
              print("Restarting single track on previous.")
-             self.play_track(self.current_track_index)
+             self._schedule_skip(current_index)
         else:
              # Cannot determine previous track
              print("Could not determine previous track.")
              self.stop_track()
 
 
+    def _schedule_skip(self, index):
+        """Debounces Next/Prev: selects the target now, but only loads it once presses stop."""
+        self._cancel_pending_skip()
+        self._pending_skip_index = index
+        self.select_listbox_item(index)
+        self._pending_skip_job = self.root.after(SKIP_DEBOUNCE_MS, self._commit_skip)
+
+    def _commit_skip(self):
+        """Plays the final target of a burst of Next/Prev presses."""
+        index = self._pending_skip_index
+        self._pending_skip_job = None
+        self._pending_skip_index = -1
+        self.play_track(index)
+
+    def _cancel_pending_skip(self):
+        """Drops a pending debounced skip (e.g. direct play, stop, or listbox refill)."""
+        if self._pending_skip_job:
+            try: self.root.after_cancel(self._pending_skip_job)
+            except tk.TclError: pass
+            self._pending_skip_job = None
+            self._pending_skip_index = -1
+
+
     def play_selected(self, event=None):
         """Plays the track double-clicked in the listbox."""
         try:
@@ -1191,8 +1779,23 @@ class MediaPlayerApp:
 
 
     # --- Volume, Time, Display Updates ---
+    def _ensure_mixer(self):
+        """Initializes the pygame mixer on first use. Returns False (after reporting) if it fails."""
+        if self._mixer_ready: return True
+        try:
+            # Explicit format and a 1024-sample buffer: avoids a re-init on first load and ALSA underruns
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+            pygame.mixer.music.set_endevent(self.MUSIC_END_EVENT)
+            pygame.mixer.music.set_volume(float(self.volume_scale.get()) / 100)
+            self._mixer_ready = True
+            print("Pygame mixer initialized.")
+        except pygame.error as e:
+            self.show_error("Pygame Error", f"Could not initialize audio mixer: {e}\nPlease ensure audio drivers are working.")
+        return self._mixer_ready
+
     def set_volume(self, val):
         """Sets the mixer volume."""
+        if not self._mixer_ready: return # Picked up from the scale when the mixer starts
         try:
             volume = float(val) / 100
             pygame.mixer.music.set_volume(volume)
@@ -1202,108 +1805,226 @@ class MediaPlayerApp:
     def format_time(self, seconds):
         """Formats seconds into MM:SS string."""
         try:
-            seconds = int(seconds)
-            if seconds < 0: seconds = 0
-            minutes = seconds // 60
-            secs = seconds % 60
-            return f"{minutes:02d}:{secs:02d}"
+            return _format_seconds(int(seconds))
         except Exception: # Catch potential errors with non-numeric input
             return "00:00"
 
+    def start_time_update(self):
+        """Starts (or restarts) the once-per-second time display updates."""
+        self._tick_gen += 1 # Retires any tick already scheduled
+        self._pos_anchor = None # Position may have jumped (new track, unpause); re-read the mixer
+        # First tick once Tk is idle, after the caller's own redraws, not inside the caller's handler
+        self.update_seek_job = self.root.after_idle(self.update_time, self._tick_gen)
+
+    def stop_time_update(self):
+        """Stops the time display updates. The pending tick isn't cancelled (no Tcl round trip);
+           it sees the bumped generation and exits. on_closing cancels it for real."""
+        self._tick_gen += 1
+        self.update_seek_job = None
+
+    def update_time(self, gen):
+        """Updates the time display and reschedules itself just after the next whole second,
+           so the label is only touched when its MM:SS text actually changes."""
+        # No update()/update_idletasks() here: Tk already coalesces the label and progress bar
+        # redraws into one idle pass, and update() would re-enter the event loop mid-callback.
+        if gen != self._tick_gen: return # Stopped or restarted since this tick was scheduled
+        self.update_seek_job = None
+        if self.playing_state != "playing": return
+        if not self._ui_visible: return # Nobody can see it; <Map> restarts the updates
+        # The one try/except for the tick; update_time_display itself runs unguarded
+        try:
+            current_pos_ms = self.update_time_display()
+        except Exception: # Silent: this runs every second, and a failing tick would flood the log
+            # pygame.error can happen if the mixer stops unexpectedly between checks.
+            current_pos_ms = -1 # Don't stop playback here, let check_music_end handle the track ending
+        if current_pos_ms >= 0 and current_pos_ms > self.current_track_duration * PREFETCH_AT_FRACTION * 1000 > 0:
+            self._prefetch_next_track()
+        delay = 1000 - (current_pos_ms % 1000) if current_pos_ms >= 0 else 1000
+        self.update_seek_job = self.root.after(delay, self.update_time, gen)
+
+    def _peek_auto_next_index(self):
+        """Returns the listbox index auto-advance would play next (mirrors next_track), or -1."""
+        if self.current_track_index < len(self.playlist) - 1: return self.current_track_index + 1
+        if self.repeat_mode == REPEAT_ALL and self.playlist: return 0
+        return -1
+
+    def _prefetch_next_track(self):
+        """Reads the upcoming track into memory in the background so the switch doesn't wait on disk."""
+        filepath = self._path_at(self._peek_auto_next_index())
+        if not filepath or filepath == self._prefetch_path: return # Nothing next, or already fetched
+        self._prefetch_path = filepath
+        self._prefetch_data = None
+        threading.Thread(target=self._prefetch_worker, args=(filepath,), daemon=True).start()
+
+    def _prefetch_worker(self, filepath):
+        """Worker thread: reads the file bytes for _prefetch_next_track (skipped above PREFETCH_MAX_BYTES)."""
+        try:
+            if os.path.getsize(filepath) > PREFETCH_MAX_BYTES: return # Too big to hold; loads by path
+            with open(filepath, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return # Playback loads by path instead, and reports the error if it fails there too
+        if self._prefetch_path == filepath: # Still the wanted track
+            self._prefetch_data = data
+
+    def _on_root_unmap(self, event):
+        """Stops time updates when the main window is minimized/hidden."""
+        if event.widget is self.root: # Child widgets' events also reach the root binding
+            self._ui_visible = False
+            self.stop_time_update()
+
+    def _on_root_map(self, event):
+        """Resumes time updates when the main window is shown again."""
+        if event.widget is not self.root: return
+        self._ui_visible = True
+        if self.playing_state == "playing":
+            self.start_time_update()
+
     def update_time_display(self):
-        """Updates the time labels and progress bar based on mixer position."""
-        if self.playing_state == "playing" and pygame.mixer.music.get_busy():
-             try:
-                current_pos_ms = pygame.mixer.music.get_pos() # Milliseconds
-                if current_pos_ms >= 0: # Check if position is valid
-                    current_pos_sec = current_pos_ms / 1000.0
-                    current_time_str = self.format_time(current_pos_sec)
-                    self.current_time_label.config(text=current_time_str)
-
-                    # Update progress bar
-                    if self.current_track_duration > 0:
-                        # Value should be seconds, matching the maximum
-                        progress_value = min(current_pos_sec, self.current_track_duration)
-                        self.progress_bar['value'] = progress_value
-                    else:
-                         self.progress_bar['value'] = 0
-             except pygame.error as e:
-                  # This can happen if the mixer stops unexpectedly between checks
-                  print(f"Pygame error during time update: {e}")
-                  # Don't stop playback here, let the main event loop handle MUSIC_END
-             except Exception as e:
-                  print(f"Unexpected error during time update: {e}")
-                  traceback.print_exc()
-        # No need for rescheduling here, handled by check_music_end
+        """Updates the time labels and progress bar based on mixer position.
+           Returns the mixer position in milliseconds (-1 if unavailable).
+           Called only from update_time, which handles errors (only while playing)."""
+        current_pos_ms = self._read_position_ms()
+        if current_pos_ms < 0: return current_pos_ms # No valid position
+        current_pos_sec = current_pos_ms // 1000 # Whole seconds drive both the label and the bar
+        current_time_str = self.format_time(current_pos_sec)
+        # Both only change when the second does; skip the Tk writes otherwise
+        # (every path that zeroes the bar also resets _last_time_str to "00:00")
+        if current_time_str != self._last_time_str:
+            self.current_time_var.set(current_time_str)
+            self._last_time_str = current_time_str
+
+            # Advance the progress bar (seconds, matching the maximum) with one step() command.
+            # The cap (set per track) keeps it just below the maximum, where step() would wrap.
+            progress_value = min(current_pos_sec, self._progress_cap)
+            if progress_value != self._progress_last:
+                self.progress_bar.step(progress_value - self._progress_last)
+                self._progress_last = progress_value
+        return current_pos_ms
+
+    def _read_position_ms(self):
+        """Playback position in ms. Read from the mixer every POS_RESYNC_TICKS ticks and
+           extrapolated from the monotonic clock in between; -1 if the mixer reports none."""
+        self._pos_ticks += 1
+        if self._pos_anchor is None or self._pos_ticks >= POS_RESYNC_TICKS:
+            # get_pos() is -1 once the music has stopped, so no separate get_busy() call is needed
+            pos_ms = self._mixer_get_pos()
+            self._pos_ticks = 0
+            self._pos_anchor = (pos_ms, time.monotonic()) if pos_ms >= 0 else None
+            return pos_ms
+        anchor_ms, anchor_time = self._pos_anchor
+        return anchor_ms + int((time.monotonic() - anchor_time) * 1000)
+
+    def _discard_end_events(self):
+        """Drops queued MUSIC_END_EVENTs (raised by stop()/load() rather than a track ending)."""
+        if self._end_via_events: pygame.event.clear(self.MUSIC_END_EVENT)
 
     def check_music_end(self):
-        """Checks for pygame events, including MUSIC_END_EVENT, and updates time."""
+        """Checks whether the playing track has ended (MUSIC_END_EVENT, or the mixer going idle
+           when there's no event queue). Time display runs separately (update_time)."""
         try:
-            for event in pygame.event.get():
-                if event.type == self.MUSIC_END_EVENT:
-                    print("Received MUSIC_END_EVENT.")
+            if not self._end_via_events:
+                # Polling fallback: the mixer stops being busy once the current track runs out
+                if (self.playing_state == "playing" and self._playing_gen == self._play_gen
+                        and self._mixer_ready and not pygame.mixer.music.get_busy()):
+                    self.next_track(from_event=True)
+                return # finally reschedules
+            # peek() answers the usual "nothing pending" without building an event list
+            if pygame.event.peek(self.MUSIC_END_EVENT):
+                pygame.event.get(self.MUSIC_END_EVENT) # Drain; one advance however many were queued
+                # Only a track that is still the one playing can have ended. Events raised by
+                # stop() or by loading another track (play gen moved on) are dropped.
+                if self.playing_state == "playing" and self._playing_gen == self._play_gen:
                     # Advance to next track, respecting repeat modes
                     self.next_track(from_event=True) # Indicate it's from the event, not user click
 
-            # Update time display periodically if playing
-            if self.playing_state == "playing" and pygame.mixer.music.get_busy():
-                 self.update_time_display()
-
         except Exception as e:
             print(f"Error in pygame event loop: {e}")
             traceback.print_exc()
         finally:
-            # Reschedule the check regardless of errors to keep the event loop running
-            self.root.after(250, self.check_music_end) # Check every 250ms
+            # Reschedule the check regardless of errors to keep the event loop running.
+            # Tracks only end while playing; otherwise a slower poll is enough.
+            delay = END_POLL_PLAYING_MS if self.playing_state == "playing" else END_POLL_IDLE_MS
+            self.root.after(delay, self.check_music_end)
 
     # update_track_display and update_album_art are called when needed (play_track, stop_track, preload_track_info)
     def update_track_display(self, title="---", artist="---", album="---", clear=False):
-        """Updates the Title, Artist, Album, and Time labels."""
-        # Trim function for long strings
-        def trim(s, length=40): return (s[:length-1] + '…') if len(s) > length else s
-
+        """Updates the Title, Artist, Album, and Time labels.
+           Title/artist/album text is debounced; time and progress reset immediately."""
         if clear:
-            self.track_title_label.config(text="---")
-            self.track_artist_label.config(text="---")
-            self.track_album_label.config(text="---")
-            self.current_time_label.config(text="00:00")
-            self.total_time_label.config(text="/ 00:00")
+            self._cancel_pending_display()
+            self.track_title_var.set("---")
+            self.track_artist_var.set("---")
+            self.track_album_var.set("---")
+            self.current_time_var.set("00:00")
+            self._last_time_str = "00:00"
+            self._progress_last = 0 # The bar is zeroed along with the time label
+            self.total_time_var.set("/ 00:00")
             self.progress_bar['value'] = 0
             self.progress_bar['maximum'] = 100 # Reset max
             self.current_track_duration = 0
-            # Reset album art to default (handled by update_album_art)
-            self.update_album_art({'art_data': None})
+            self._progress_cap = 0
+            self._show_default_art()
         else:
             # Use defaults if metadata is missing/empty
             display_title = title if title else "Unknown Title"
             display_artist = artist if artist else "Unknown Artist"
             display_album = album if album else "Unknown Album"
 
-            self.track_title_label.config(text=trim(display_title))
-            self.track_artist_label.config(text=trim(display_artist, 35))
-            self.track_album_label.config(text=trim(display_album, 35))
+            # Trailing-edge debounce: a burst of track changes only relayouts the labels once
+            self._display_pending = (display_title, display_artist, display_album)
+            if not self._display_job:
+                self._display_job = self.root.after(DISPLAY_DEBOUNCE_MS, self._flush_track_display)
 
             # Reset current time display, total time depends on duration
             total_time_str = self.format_time(self.current_track_duration)
-            self.current_time_label.config(text="00:00")
-            self.total_time_label.config(text=f"/ {total_time_str}")
-            # Set progress bar max (value reset in play_track/stop_track)
+            self.current_time_var.set("00:00")
+            self._last_time_str = "00:00"
+            self._progress_last = 0 # The bar is zeroed along with the time label
+            self.total_time_var.set(f"/ {total_time_str}")
+            # Reset the progress bar for the new track (update_time_display steps it from 0)
+            self.progress_bar['value'] = 0
             self.progress_bar['maximum'] = self.current_track_duration if self.current_track_duration > 0 else 100
-
-
-    def update_album_art(self, metadata):
-        """Updates the album art label using data from metadata dict."""
+            # Unknown duration: the bar stays at 0
+            self._progress_cap = self.current_track_duration - 0.01 if self.current_track_duration > 0 else 0
+
+
+    def _flush_track_display(self):
+        """Writes the latest debounced title/artist/album to the labels."""
+        self._display_job = None
+        pending, self._display_pending = self._display_pending, None
+        if pending is None: return
+        title, artist, album = pending
+        self.track_title_var.set(_ellipsize(title, 40))
+        self.track_artist_var.set(_ellipsize(artist, 35))
+        self.track_album_var.set(_ellipsize(album, 35))
+
+    def _cancel_pending_display(self):
+        """Drops a debounced title/artist/album update that hasn't been drawn yet."""
+        if self._display_job:
+            try: self.root.after_cancel(self._display_job)
+            except tk.TclError: pass # Job already ran or root destroyed
+            self._display_job = None
+        self._display_pending = None
+
+    def update_album_art(self, art_data, art_key=None):
+        """Updates the album art label from embedded image bytes (placeholder if None).
+           art_key (a digest of the bytes) indexes the decoded-art cache; without it nothing is cached."""
         art_label = self.album_art_label
-        art_data = metadata.get('art_data')
         # Get the current default art image (might be None if loading failed)
         current_default_art = self.default_album_art
 
         if art_data:
             try:
-                img_data = io.BytesIO(art_data)
-                pil_img = Image.open(img_data)
-                pil_img.thumbnail(ALBUM_ART_SIZE, Image.Resampling.LANCZOS)
-                tk_img = ImageTk.PhotoImage(pil_img)
+                tk_img = self._art_cache.get(art_key) if art_key else None
+                if tk_img is not None:
+                    self._art_cache.move_to_end(art_key)
+                else:
+                    tk_img = _decode_art(art_data)
+                    if art_key:
+                        self._art_cache[art_key] = tk_img
+                    if len(self._art_cache) > ART_CACHE_MAX:
+                        self._art_cache.popitem(last=False) # Evict the least recently shown
                 art_label.config(image=tk_img)
                 art_label.image = tk_img # Keep reference! Important.
             except Exception as e:
@@ -1321,9 +2042,12 @@ class MediaPlayerApp:
          """Selects and makes visible the item at the given listbox index."""
          try:
              if 0 <= index < self.playlist_box.size():
-                 self.playlist_box.selection_clear(0, tk.END)
-                 self.playlist_box.selection_set(index)
-                 self.playlist_box.activate(index)
+                 # Already the sole selection (e.g. repeat-one, re-selecting the playing row): skip the
+                 # clear/set/activate round trips. Read from the widget, since clicks change it too.
+                 if self.playlist_box.curselection() != (index,):
+                     self.playlist_box.selection_clear(0, tk.END)
+                     self.playlist_box.selection_set(index)
+                     self.playlist_box.activate(index)
                  self.playlist_box.see(index) # Ensure item is visible
          except tk.TclError as e:
              # Can happen if listbox is updated while selection is attempted
@@ -1358,44 +2082,64 @@ class MediaPlayerApp:
 
 
     def sort_playlist_action(self, sort_key):
-        """Sorts the original_playlist_order and refreshes the view."""
+        """Sorts the original_playlist_order and refreshes the view.
+           Tag sorts read metadata on a worker thread and are applied when it finishes."""
         if not self.original_playlist_order:
             self.show_info("Empty Playlist", "Nothing to sort.")
             return
 
         print(f"Sorting playlist by: {sort_key}...")
-        # Show busy cursor? (More complex UI feedback)
-
-        metadata_list = []
-        # --- Fetch metadata only if needed ---
+        self._sort_gen += 1 # A sort still reading tags is superseded
+        paths = list(self.original_playlist_order) # Snapshot; the sort applies only if it's still current
         if sort_key in ('title', 'artist', 'album'):
-            fetch_start_time = time.time()
-            missing_files = 0
-            # Consider threading for large lists
-            for i, path in enumerate(self.original_playlist_order):
-                 meta = self.get_track_metadata(path) # Handles missing files
-                 if meta['title'].startswith("[Missing]"): missing_files += 1
-                 metadata_list.append({
-                     'path': path,
-                     'title': meta.get('title', '').lower(),
-                     'artist': meta.get('artist', '').lower(),
-                     'album': meta.get('album', '').lower(),
-                 })
-            fetch_end_time = time.time()
-            print(f"Metadata fetched for {len(metadata_list)} items in {fetch_end_time - fetch_start_time:.2f}s.")
-            if missing_files > 0: print(f"Note: {missing_files} missing files encountered.")
+            # Reading every track's tags can take a while: never on (or waited for from) the Tk thread
+            threading.Thread(target=self._sort_worker, args=(self._sort_gen, sort_key, paths), daemon=True).start()
+        elif sort_key == 'path':
+            sort_keys = [p.lower() for p in paths] # Case-insensitive path sort, no I/O
+            self._on_playlist_sorted(self._sort_gen, sort_key, paths, sort_keys)
+        else:
+            print(f"Unknown sort key: {sort_key}")
+
+    def _sort_worker(self, gen, sort_key, paths):
+        """Worker thread: reads the sort key of every track in parallel on the metadata pool
+           and posts the keys (or the error) back to the Tk thread."""
+        fetch_start_time = time.time()
+        try:
+            metas = list(self._meta_pool.map(self.get_track_metadata, paths)) # Handles missing files
+        except RuntimeError: return # Pool shut down (closing)
+        except Exception as e:
+            traceback.print_exc()
+            try: self.root.after(0, self._on_playlist_sort_failed, gen, sort_key, e)
+            except RuntimeError: pass # Tk already shut down
+            return
+        missing_files = 0
+        sort_keys = [] # Parallel to paths, one key per track
+        for meta in metas:
+             if meta['title'].startswith("[Missing]"): missing_files += 1
+             sort_keys.append(meta.get(sort_key, '').lower())
+        print(f"Metadata fetched for {len(sort_keys)} items in {time.time() - fetch_start_time:.2f}s.")
+        if missing_files > 0: print(f"Note: {missing_files} missing files encountered.")
+        try: self.root.after(0, self._on_playlist_sorted, gen, sort_key, paths, sort_keys)
+        except RuntimeError: pass # Tk already shut down
+
+    def _on_playlist_sort_failed(self, gen, sort_key, error):
+        """Reports a failed sort (Tk thread), unless another sort replaced it."""
+        if gen != self._sort_gen: return
+        self.show_error("Sort Error", f"Could not sort by {sort_key}:\n{error}")
+
+    def _on_playlist_sorted(self, gen, sort_key, paths, sort_keys):
+        """Applies a finished sort (Tk thread). Dropped if another sort started
+           or the playlist changed while the keys were being read."""
+        if gen != self._sort_gen: return
+        if self.original_playlist_order != paths:
+            print("Playlist changed while sorting; sort discarded.")
+            return
 
         # --- Perform Sort ---
         try:
-             if sort_key == 'path':
-                  self.original_playlist_order.sort(key=lambda p: p.lower()) # Case-insensitive path sort
-             elif sort_key in ('title', 'artist', 'album'):
-                  # Sort the metadata list first
-                  metadata_list.sort(key=lambda x: x.get(sort_key, ''))
-                  # Update original_playlist_order based on sorted metadata
-                  self.original_playlist_order = [item['path'] for item in metadata_list]
-             else:
-                  print(f"Unknown sort key: {sort_key}"); return
+             # Sort indices by the precomputed keys (stable, C-level key lookup)
+             order = sorted(range(len(sort_keys)), key=sort_keys.__getitem__)
+             self.original_playlist_order = [paths[i] for i in order]
 
         except Exception as e:
              self.show_error("Sort Error", f"Could not sort by {sort_key}:\n{e}")
@@ -1406,12 +2150,13 @@ class MediaPlayerApp:
         self.is_shuffled = False # Turn off shuffle when sorting explicitly
         self.shuffle_menu_var.set(self.is_shuffled)
         self.update_shuffle_button()
-        self._apply_filters_and_shuffle()
+        self._apply_filters_and_shuffle(force_refresh=True) # Master list changed
 
 
     def _apply_filters_and_shuffle(self, force_refresh=False):
         """Applies search filter and shuffle to the original list, updates view.
-           Includes optimization to avoid work if state hasn't changed."""
+           Includes optimization to avoid work if state hasn't changed.
+           force_refresh=True means the master list itself changed (drops the filter cache)."""
 
         # Optimization: Check if relevant state changed
         search_changed = self.current_search_term != self._last_applied_search
@@ -1424,19 +2169,30 @@ class MediaPlayerApp:
         print(f"Applying filters/shuffle (Force={force_refresh}, Search='{self.current_search_term}', Shuffle={self.is_shuffled})...")
         start_time = time.time()
 
+        if force_refresh: # Master list changed; cached matches and search keys are stale
+            self._filtered_cache = None
+            self._search_index = None
         temp_playlist = list(self.original_playlist_order) # Start with full master list
 
         # Apply search filter (currently simple filename check)
         # TODO: Implement more robust metadata search (requires caching or slower filtering)
         if self.current_search_term:
-            try:
-                temp_playlist = [
-                    path for path in temp_playlist
-                    if self.current_search_term in os.path.basename(path).lower()
-                ]
-            except Exception as e:
-                 print(f"Error during search filtering: {e}")
-                 # Continue without filtering if search fails? Or show error?
+            cached = self._filtered_cache
+            if cached is not None and cached[0] == self.current_search_term:
+                temp_playlist = list(cached[1]) # Only shuffle changed: reuse the matches
+            else:
+                try:
+                    term = self.current_search_term
+                    if self._search_index is None: self._rebuild_search_index()
+                    # One C-level substring test per track against the prebuilt lowercase keys
+                    temp_playlist = [
+                        path for path, key in zip(temp_playlist, self._search_index)
+                        if term in key
+                    ]
+                    self._filtered_cache = (term, tuple(temp_playlist)) # Unshuffled, master order
+                except Exception as e:
+                     print(f"Error during search filtering: {e}")
+                     # Continue without filtering if search fails? Or show error?
 
         # Apply shuffle if enabled
         if self.is_shuffled:
@@ -1449,7 +2205,7 @@ class MediaPlayerApp:
         playing_path = None
         current_lb_index = self.current_track_index
         if self.playing_state != "stopped" and current_lb_index != -1:
-            playing_path = self.listbox_path_map.get(current_lb_index) # Get path *before* map updates
+            playing_path = self._path_at(current_lb_index) # Get path *before* map updates
 
         # --- Repopulate UI ---
         self._repopulate_listbox() # Update the Listbox UI (also updates listbox_path_map)
@@ -1457,15 +2213,11 @@ class MediaPlayerApp:
         # --- Try to re-select the playing track ---
         new_playing_index = -1
         if playing_path:
-             # Find the path in the *new* listbox_path_map values
-             # Create inverse map for efficient lookup (path -> index)
+             # Find the path in the *new* listbox_path_map (paths are unique in the playlist)
              try:
-                 # Need to handle potential duplicate paths if allowed, though currently prevented
-                 inverted_map = {path: idx for idx, path in self.listbox_path_map.items()}
-                 if playing_path in inverted_map:
-                     new_playing_index = inverted_map[playing_path]
-             except Exception as e: # Catch potential errors during map inversion/lookup
-                 print(f"Error finding playing track's new index: {e}")
+                 new_playing_index = self.listbox_path_map.index(playing_path)
+             except ValueError:
+                 pass # Filtered out of the new view
 
 
         # --- Update current_track_index and selection ---
@@ -1494,37 +2246,83 @@ class MediaPlayerApp:
         print(f"Applied filters/shuffle in {end_time - start_time:.4f} seconds.")
 
 
+    def _rebuild_search_index(self):
+        """Builds the lowercased search key (file name) for every track in the master list."""
+        basename = os.path.basename
+        self._search_index = [basename(path).lower() for path in self.original_playlist_order]
+
     def search_playlist_action(self, event=None):
         """Initiated search based on the search entry."""
+        self._cancel_pending_search() # Return/button press runs now; drop the debounced run
         self.current_search_term = self.search_var.get().lower().strip()
         self._apply_filters_and_shuffle() # Will refresh if term changed
 
+    def _on_search_typed(self, event=None):
+        """Search-as-you-type: filters once typing pauses for SEARCH_DEBOUNCE_MS."""
+        if event is not None and event.keysym == 'Return': return # Handled by the <Return> binding
+        self._cancel_pending_search()
+        self._search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.search_playlist_action)
+
+    def _cancel_pending_search(self):
+        """Drops a pending debounced search."""
+        if self._search_job:
+            try: self.root.after_cancel(self._search_job)
+            except tk.TclError: pass
+            self._search_job = None
+
     def clear_search_action(self):
         """Clears the search term and refreshes the playlist view."""
+        self._cancel_pending_search()
         self.search_var.set("")
         self.current_search_term = ""
         self._apply_filters_and_shuffle() # Will refresh if term changed
 
 
     # --- Closing ---
+    def _shutdown_pygame(self):
+        """Worker thread: releases the audio mixer at shutdown."""
+        try:
+            with self._mixer_load_lock: # Let an in-flight background load finish first
+                if self._mixer_ready:
+                    self._mixer_ready = False
+                    pygame.mixer.music.set_endevent() # Clear end event listener
+                    pygame.mixer.quit()
+            print("Pygame mixer quit successfully.")
+        except Exception as e:
+            print(f"Error during Pygame quit: {e}")
+
     def on_closing(self):
         """Handles application close event."""
         print("Closing application...")
-        # Stop scheduled tasks
-        # if self.update_seek_job: self.root.after_cancel(self.update_seek_job) # Handled by root.destroy()
+        self._title_prefetch_gen += 1 # Stop any background title pass
+        self._sort_gen += 1 # Drop any sort still reading tags
+        self._cancel_pending_display()
+        self._cancel_pending_search()
+        self._meta_pool.shutdown(wait=False, cancel_futures=True)
+        # Stop scheduled tasks (the time tick is cancelled outright here, not just retired)
+        if self.update_seek_job:
+            try: self.root.after_cancel(self.update_seek_job)
+            except tk.TclError: pass # Job already ran or root destroyed
+        self.stop_time_update()
         if self.browser_window and self.browser_window.winfo_exists():
             try: self.browser_window.destroy()
             except tk.TclError: pass # Ignore if already destroyed
         try:
             self.stop_track() # Stop music playback
-            # Explicitly quit pygame modules
-            pygame.mixer.music.set_endevent() # Clear end event listener
-            pygame.mixer.quit()
-            pygame.quit()
-            print("Pygame quit successfully.")
+            # Closing the audio device can block while buffers drain; do it off the Tk thread so the
+            # window goes away now. Non-daemon, so the interpreter waits for it before exiting
+            # (pygame's own exit hook then quits the remaining modules).
+            threading.Thread(target=self._shutdown_pygame, name="pygame-shutdown").start()
         except Exception as e:
             print(f"Error during Pygame quit: {e}")
         finally:
+            # Flush the persistent metadata cache to disk. Pool/title workers may still be
+            # running (the pool isn't waited for), so close under the lock they write through.
+            with self._meta_cache_lock:
+                if self._meta_cache is not None:
+                    try: self._meta_cache.close()
+                    except Exception as e: print(f"Error closing metadata cache: {e}")
+                    self._meta_cache = None
             # Destroy the Tkinter window
             try:
                 if self.root.winfo_exists():